@@ -34,6 +34,11 @@ def test_has(tk_root):
         tkmsgcat.locale(locale)
         assert tkmsgcat.has("Hello", search_all=False)
 
+    # Strings with spaces
+    assert not tkmsgcat.has("Not translated")
+    tkmsgcat.add("Not translated", "अनूदित")
+    assert tkmsgcat.has("Not translated")
+
 
 @pytest.mark.parametrize("locale", ["hi", "mr"])
 def test_locale(tk_root, locale: str):
@@ -47,8 +52,28 @@ def test_loaded_from(tk_root):
     ).replace("\\", "/")
 
 
+def test_load_relative(tk_root, tmp_path, monkeypatch):
+    msgs = pathlib.Path(__file__).parent / "msgs"
+    other = tmp_path / "msgs"
+    other.mkdir()
+
+    monkeypatch.chdir(msgs.parent)
+    for _ in range(2):
+        tkmsgcat.load("msgs")
+        assert tkmsgcat.loaded_from() == str(msgs.resolve()).replace("\\", "/")
+
+    # The same relative path resolves against the new working directory
+    monkeypatch.chdir(tmp_path)
+    tkmsgcat.load("msgs")
+    assert tkmsgcat.loaded_from() == str(other.resolve()).replace("\\", "/")
+
+    tkmsgcat.load(msgs)
+
+
 def test_loaded_locales(tk_root):
     assert set(("mr", "hi")).issubset(tkmsgcat.loaded_locales())
+    tkmsgcat.locale("de")
+    assert tkmsgcat.is_loaded("de")
 
 
 @pytest.mark.parametrize(
@@ -63,6 +88,11 @@ def test_longest(tk_root, locale: str, translation: str, maxlen: int):
     tkmsgcat.add("Good Morning", translation)
     assert tkmsgcat.longest(["Hello", "Good Morning"]) == maxlen
 
+    # Translations are cached now
+    tkmsgcat.get("Hello")
+    tkmsgcat.get("Good Morning")
+    assert tkmsgcat.longest(["Hello", "Good Morning"]) == maxlen
+
 
 @pytest.mark.parametrize(
     "locale, translation, maxlen",
@@ -76,11 +106,27 @@ def test_longest_in(tk_root, locale: str, translation: str, maxlen: int):
     assert tkmsgcat.longest_in(locale, ["Hello", "Good Morning"]) == maxlen
 
 
+def test_longest_non_bmp(tk_root):
+    tkmsgcat.locale("hi")
+    tkmsgcat.add("Smile", "a😀b")
+    cold = tkmsgcat.longest(["Smile"])
+    tkmsgcat.get("Smile")  # Cache the translation
+    assert tkmsgcat.longest(["Smile"]) == cold
+
+
 def test_preferences(tk_root):
     tkmsgcat.locale("en_US_funky")
     assert tkmsgcat.preferences() == ("en_us_funky", "en_us", "en", "")
 
 
+@pytest.mark.parametrize("locale", ["C", "en_US_funky", "de__CH_spec", "_x_"])
+def test_preferences_tcl(tk_root, locale: str):
+    # pylint: disable=protected-access
+    tkmsgcat.locale(locale)
+    msgcat = tkmsgcat._default_msgcat
+    assert msgcat.preferences == msgcat._preferences_tcl()
+
+
 def test_add_to(tk_root):
     tkmsgcat.add_to("mr", "Today", "आज")
     assert tkmsgcat.get_from("mr", "Today") == "आज"
@@ -105,17 +151,85 @@ def test_update(tk_root):
     assert tkmsgcat.get("Tommorrow") == "कल"
 
 
+def test_special_chars(tk_root):
+    tkmsgcat.update_to("mr", {'"Quoted"': "{Braced}", "Back\\slash": "$var [cmd]"})
+    assert tkmsgcat.get_from("mr", '"Quoted"') == "{Braced}"
+    assert tkmsgcat.get_from("mr", "Back\\slash") == "$var [cmd]"
+
+
+def test_list_translation(tk_root):
+    tkinter._default_root.eval("::msgcat::mcset hi Colors [list red {light green}]")
+    assert tkmsgcat.get_from("hi", "Colors") == "red {light green}"
+
+
+def test_batch(tk_root):
+    tkmsgcat.locale("hi")
+    with tkmsgcat.batch():
+        tkmsgcat.add("Month", "महीना")
+        tkmsgcat.add_to("mr", "Month", "महिना")
+        with tkmsgcat.batch():
+            tkmsgcat.update_to("mr", {"Year": "वर्ष"})
+        assert tkmsgcat.get_from("mr", "Year") == "Year"
+    assert tkmsgcat.get("Month") == "महीना"
+    assert tkmsgcat.get_from("mr", "Month") == "महिना"
+    assert tkmsgcat.get_from("mr", "Year") == "वर्ष"
+
+
+def test_batch_error(tk_root):
+    tkmsgcat.locale("hi")
+    with pytest.raises(ValueError):
+        with tkmsgcat.batch():
+            tkmsgcat.add("Decade", "दशक")
+            raise ValueError
+    assert not tkmsgcat.has("Decade")
+    tkmsgcat.add("Decade", "दशक")  # Batching has ended
+    assert tkmsgcat.has("Decade")
+
+
 @pytest.mark.parametrize("locale, translation", [("hi", "नमस्ते"), ("mr", "नमस्कार")])
 def test_get(tk_root, locale: str, translation: str):
     tkmsgcat.locale(locale)
     assert tkmsgcat.get("Hello") == translation
 
 
+def test_get_cache(tk_root):
+    tkmsgcat.locale("hi")
+    tkmsgcat.add("Week", "सप्ताह")
+    assert tkmsgcat.get("Week") == "सप्ताह"
+    tkmsgcat.add("Week", "हफ़्ता")
+    assert tkmsgcat.get("Week") == "हफ़्ता"
+    tkmsgcat.locale("mr")
+    assert tkmsgcat.get("Week") == "Week"
+
+
+def test_get_external_locale(tk_root):
+    tkmsgcat.locale("hi")
+    tkinter._default_root.eval("::msgcat::mclocale mr")
+    assert tkmsgcat.get("Hello") == "नमस्ते"
+    tkinter._default_root.eval("::msgcat::mclocale hi")
+    assert tkmsgcat.get("Hello") == "नमस्ते"
+
+
+def test_get_cache_preferences(tk_root):
+    tkmsgcat.locale("mr_IN")
+    assert tkmsgcat.get("Hello") == "नमस्कार"
+    tkmsgcat.add_to("mr", "Hello", "रामराम")
+    assert tkmsgcat.get("Hello") == "रामराम"
+    tkmsgcat.add_to("mr", "Hello", "नमस्कार")
+    assert tkmsgcat.get("Hello") == "नमस्कार"
+
+
 @pytest.mark.parametrize("locale, translation", [("hi", "नमस्ते"), ("mr", "नमस्कार")])
 def test_get_from(tk_root, locale: str, translation: str):
     assert tkmsgcat.get_from(locale, "Hello") == translation
 
 
+def test_get_from_keeps_locale(tk_root):
+    tkmsgcat.locale("hi")
+    assert tkmsgcat.get_from("MR", "Hello") == "नमस्कार"
+    assert tkmsgcat.locale() == "hi"
+
+
 # def test_locale_handler(tk_root):
 #     class FakeException(Exception):
 #         pass
@@ -138,11 +252,56 @@ def test_missing_handler(tk_root):
 
     tkmsgcat.missing_handler(handler)
     assert tkmsgcat.get("MISSING") == "_"
+    assert tkmsgcat.get_from("en", "MISSING") == "_"
     assert tkmsgcat.get("NOT_MISSING") == "NOT_MISSING"
     tkmsgcat.missing_handler()
     assert tkmsgcat.get("MISSING") == "MISSING"
 
 
+def test_missing_handler_commands(tk_root):
+    # pylint: disable=protected-access
+    root = tkinter._default_root
+
+    def num_commands() -> int:
+        return len(root._tclCommands or [])
+
+    def handler(locale, src, *args):
+        return src
+
+    def other_handler(locale, src, *args):
+        return src
+
+    before = num_commands()
+    tkmsgcat.missing_handler(handler)
+    assert num_commands() == before + 1
+
+    # Reassigning the same handler doesn't register it again
+    tkmsgcat.missing_handler(handler)
+    assert num_commands() == before + 1
+
+    # Replacing the handler deletes the previous command
+    tkmsgcat.missing_handler(other_handler)
+    assert num_commands() == before + 1
+
+    tkmsgcat.missing_handler()
+    assert num_commands() == before
+
+
+def test_missing_handler_uncached(tk_root):
+    calls = []
+
+    def handler(locale, src, *args):
+        calls.append(src)
+        return f"{src}{len(calls)}"
+
+    tkmsgcat.locale("hi")
+    tkmsgcat.missing_handler(handler)
+    assert tkmsgcat.get("Q") == "Q1"
+    assert tkmsgcat.get("Q") == "Q2"
+    assert tkmsgcat.get("Hello") == "नमस्ते"
+    tkmsgcat.missing_handler()
+
+
 # def test_preload_handler(tk_root):
 #     def handler(*locales):
 #         if "missing" in locales:
@@ -152,6 +311,49 @@ def test_missing_handler(tk_root):
 #     tkmsgcat.locale("missing")
 
 
+def test_new_root(tk_root, monkeypatch):
+    tkmsgcat.locale("hi")
+    assert tkmsgcat.get("Hello") == "नमस्ते"
+
+    monkeypatch.setattr(tkinter, "_default_root", None)
+    tkinter.Tk()  # Becomes the default root
+    assert not tkmsgcat.is_init()
+    assert tkmsgcat.get_from("hi", "Hello") == "Hello"
+
+    monkeypatch.undo()
+    assert tkmsgcat.get_from("hi", "Hello") == "नमस्ते"
+
+
+def test_subclass_without_super_init(tk_root):
+    class Catalog(tkmsgcat.MessageCatalog):
+        def __init__(self, name: str) -> None:
+            # pylint: disable=super-init-not-called
+            self.name = name
+
+    catalog = Catalog("custom")
+    assert catalog.get_from("mr", "Hello") == "नमस्कार"
+
+
 def test_unload(tk_root):
     tkmsgcat.unload()
     assert not tkmsgcat.is_init()
+
+
+def test_unload_resolves_again(tk_root, tmp_path):
+    first, second, link = tmp_path / "first", tmp_path / "second", tmp_path / "link"
+    first.mkdir()
+    second.mkdir()
+    try:
+        link.symlink_to(first, target_is_directory=True)
+    except OSError:  # pragma: no cover
+        pytest.skip("Symlinks aren't supported")
+
+    tkmsgcat.load(link)
+    assert tkmsgcat.loaded_from() == str(first.resolve()).replace("\\", "/")
+
+    link.unlink()
+    link.symlink_to(second, target_is_directory=True)
+    tkmsgcat.unload()
+    tkmsgcat.load(link)
+    assert tkmsgcat.loaded_from() == str(second.resolve()).replace("\\", "/")
+    tkmsgcat.unload()
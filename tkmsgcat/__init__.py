@@ -19,10 +19,22 @@ from __future__ import annotations
 
 import contextlib
 import logging
-import pathlib
+import os
 import sys
 import tkinter as tk
-from typing import Tuple, cast, no_type_check, overload
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Tuple,
+    TypeVar,
+    cast,
+    no_type_check,
+    overload,
+)
+
+if TYPE_CHECKING:
+    import pathlib
 
 if sys.version_info >= (3, 9):
     from collections.abc import Callable, Iterator
@@ -33,6 +45,7 @@ __all__ = [
     "MessageCatalog",
     "add",
     "add_to",
+    "batch",
     "get",
     "get_from",
     "has",
@@ -51,6 +64,49 @@ __all__ = [
 
 log = logging.getLogger("tkmsgcat")
 
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+_T = TypeVar("_T", bound="MessageCatalog")
+
+# Evaluates a command with a different locale set temporarily. The command
+# runs at the global level, like commands invoked from Python do, so that
+# msgcat resolves translations and package options of the global namespace.
+_INLOCALE_PROC = """
+namespace eval ::tkmsgcat {
+    proc inlocale {locale args} {
+        set oldlocale [::msgcat::mclocale]
+        ::msgcat::mclocale $locale
+        try {
+            uplevel #0 $args
+        } finally {
+            ::msgcat::mclocale $oldlocale
+        }
+    }
+}
+"""
+
+# ! Tk bug: All backslashes in paths need to be replaced by forward slashes
+_BS_TO_FS = str.maketrans("\\", "/") if os.sep == "\\" else None
+
+# Upper bound on the number of entries in each cache of a `MessageCatalog`.
+_CACHE_SIZE = 4096
+
+
+def _cache_put(cache: dict[_K, _V], key: _K, value: _V) -> None:
+    if len(cache) >= _CACHE_SIZE:
+        # Evict the oldest entry, dicts preserve insertion order
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _tcl_str(value: Any) -> str:
+    # tk.call converts list valued results to tuples, join them back the way
+    # Tcl would have formatted the list
+    if isinstance(value, tuple):
+        # pylint: disable-next=protected-access
+        return cast(str, tk._join(value))  # type: ignore[attr-defined]
+    return str(value)
+
 
 # Python <= 3.7 doesn't have this method.
 @no_type_check
@@ -71,29 +127,63 @@ def _get_default_root(what: str = None) -> tk.Tk:
 
 
 class _PackageOption:
+    # pylint: disable=protected-access
+
+    # Every option, so that all the handlers can be forgotten at once
+    _options: list[_PackageOption] = []
+
     def __init__(self, cmd: str) -> None:
         self.__cmd = cmd
-        self.__handler = ""
+        # Registered callbacks and their Tcl command names per catalog
+        self.__handlers: weakref.WeakKeyDictionary[
+            MessageCatalog, tuple[Callable[..., Any], str]
+        ] = weakref.WeakKeyDictionary()
+        self._options.append(self)
+
+    @classmethod
+    def forget_all(cls, instance: MessageCatalog, delete: bool = True) -> None:
+        for option in cls._options:
+            current = option.__handlers.pop(instance, None)
+            if current is not None and delete:
+                instance.root.deletecommand(current[1])
+
+    def is_set(self, instance: MessageCatalog) -> bool:
+        return instance in self.__handlers
 
     def __set__(
         self,
         instance: MessageCatalog,
         value: Callable,  # type: ignore
     ) -> None:
-        self.__handler = instance.root.register(value)
-        instance.eval_(f"::msgcat::mcpackageconfig set {self.__cmd} {self.__handler}")
-
-    def __get__(self, instance: MessageCatalog, _=None) -> str:  # type: ignore
+        current = self.__handlers.get(instance)
+        if current is not None and current[0] is value:
+            return
+        handler = instance.root.register(value)
+        instance.eval_("::msgcat::mcpackageconfig", "set", self.__cmd, handler)
+        if current is not None:
+            instance.root.deletecommand(current[1])
+        self.__handlers[instance] = (value, handler)
+        instance._clear_caches()
+
+    def __get__(self, instance: MessageCatalog | None, _=None) -> str:  # type: ignore
+        if instance is None:
+            return self  # type: ignore[return-value]
         try:
-            return instance.eval_(f"::msgcat::mcpackageconfig get {self.__cmd}")
+            return _tcl_str(
+                instance.eval_("::msgcat::mcpackageconfig", "get", self.__cmd)
+            )
         except tk.TclError as exc:
             raise AttributeError(f"No handler found for {self.__cmd!r}") from exc
 
     def __delete__(self, instance: MessageCatalog) -> None:
         try:
-            instance.eval_(f"::msgcat::mcpackageconfig unset {self.__cmd}")
+            instance.eval_("::msgcat::mcpackageconfig", "unset", self.__cmd)
         except tk.TclError:  # pragma: no cover
             pass
+        current = self.__handlers.pop(instance, None)
+        if current is not None:
+            instance.root.deletecommand(current[1])
+        instance._clear_caches()
 
 
 class MessageCatalog:
@@ -106,56 +196,137 @@ class MessageCatalog:
         not the Python interpreter! In practice, this means that you need to
         have a single `tkinter.Tk` instance to share the loaded translations
         and locales.
+
+    Caution: Caching
+        Translations and the current locale are memoized per instance, except
+        the strings returned by a `missing_handler`. Changes made to the
+        message catalog directly via Tcl or through another `MessageCatalog`
+        instance aren't seen until the cache gets cleared by one of the
+        mutating methods of this instance. Lookups are always done in the
+        locale known to this instance, even if it was changed elsewhere. All of
+        this is forgotten when the default root window is replaced.
     """
 
+    __slots__ = (
+        "__weakref__",
+        "_locale",
+        "_root",
+        "_tk",
+        "_inlocale_defined",
+        "_cache",
+        "_fmt_cache",
+        "_has_cache",
+        "_loaded_locales",
+        "_batch",
+    )
+
+    # Resolved translation directories keyed by working dir and input path
+    _resolved_cache: dict[tuple[str, str], str] = {}
+
+    _locale: str | None
+    _root: tk.Tk | None
+    _tk: Any
+    _inlocale_defined: bool
+    # Unformatted translations by locale, then by source string
+    _cache: dict[str, dict[str, str]]
+    _fmt_cache: dict[tuple[str, str, tuple[str, ...]], str]
+    _has_cache: dict[tuple[str, str, bool], bool]
+    _loaded_locales: tuple[str] | None
+    _batch: dict[str, list[str]] | None
+
+    def __new__(cls: type[_T], *_: Any, **__: Any) -> _T:
+        # Initialised here so that subclasses needn't call super().__init__()
+        self = super().__new__(cls)
+        self._locale = None
+        self._root = None
+        self._tk = None
+        self._inlocale_defined = False
+        self._cache = {}
+        self._fmt_cache = {}
+        self._has_cache = {}
+        self._loaded_locales = None
+        self._batch = None
+        return self
+
+    def _clear_caches(self) -> None:
+        self._cache.clear()
+        self._fmt_cache.clear()
+        self._has_cache.clear()
+        self._loaded_locales = None
+
+    def _forget(self, locale_: str) -> None:
+        # Translations of a locale are used by every locale that prefers it,
+        # i.e. all locales prefixed by it and all locales for the root locale.
+        locale_ = locale_.lower()
+        prefix = locale_ + "_"
+        for cached in list(self._cache):
+            if not locale_ or cached == locale_ or cached.startswith(prefix):
+                del self._cache[cached]
+        self._fmt_cache.clear()
+        self._has_cache.clear()
+
+    def _reset(self) -> None:
+        # Forgets everything tied to the Tcl interpreter of the root window
+        self._locale = None
+        self._root = None
+        self._tk = None
+        self._inlocale_defined = False
+        self._clear_caches()
+
+    def _check_root(self) -> tk.Tk:
+        # Called before using anything cached, which is only valid as long as
+        # the default root window remains the same.
+        root = self._root
+        # pylint: disable-next=protected-access
+        if root is None or root is not tk._default_root:  # type: ignore[attr-defined]
+            root = cast(tk.Tk, _get_default_root(what="use msgcat"))
+            if self._root is not None:
+                # The new root has its own interpreter, handlers died with the
+                # old one along with its translations
+                _PackageOption.forget_all(self, delete=False)
+                self._reset()
+            self._root = root
+        return root
+
     @property
     def root(self) -> tk.Tk:
-        return cast(tk.Tk, _get_default_root(what="use msgcat"))
-
-    def eval_(self, cmd: str) -> str:
-        log.debug("Evaluating %s", cmd)
-        return self.root.eval(cmd)
-
-    def _splitlist(self, __s: str) -> tuple[str]:
+        return self._check_root()
+
+    def eval_(self, *args: Any) -> Any:
+        # Arguments are passed as Tcl objects, they need no quoting.
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Evaluating %s", args)
+        root = self._check_root()
+        tkapp = self._tk
+        if tkapp is None:
+            tkapp = self._tk = root.tk
+        return tkapp.call(*args)
+
+    def _eval_list(self, *args: Any) -> tuple[str]:
+        # Tcl lists come back as tuples; splitlist only parses a plain string
+        # result, while str() converts elements returned as Tcl_Obj.
+        tklist = self.eval_(*args)
         # pylint: disable=deprecated-typing-alias
-        return cast(Tuple[str], self.root.splitlist(__s))
-
-    @staticmethod
-    def _join(*__l: str) -> str:
-        new_l = []
-        for i in __l:
-            stripped = i.strip('"')
-            new_l.append(f'"{stripped}"')
-        return " ".join(new_l)
-
-    @staticmethod
-    def _dict2str(__d: dict[str, str]) -> str:
-        lst = []
-        for key, val in __d.items():
-            # Append quotes to support strings with spaces
-            s_key = key.strip('"')
-            s_val = val.strip('"')
-            key = f'"{s_key}"'
-            val = f'"{s_val}"'
-            lst.extend([key, val])
-        return " ".join(lst)
-
-    @contextlib.contextmanager
-    def _locale_ctx(self, newlocale: str) -> Iterator[None]:
-        oldlc = self.locale
-        self.locale = newlocale
-        try:
-            yield None
-        finally:
-            self.locale = oldlc
+        return cast(Tuple[str], tuple(map(str, self._tk.splitlist(tklist))))
+
+    def _eval_in(self, locale_: str, *args: Any) -> Any:
+        # Calls a msgcat command as if `locale_` was the current locale, in a
+        # single round-trip instead of switching the locale there and back.
+        # The locale is always passed, as the one cached here could be stale
+        # and results are cached under it.
+        if not self._inlocale_defined:
+            self.eval_("eval", _INLOCALE_PROC)
+            self._inlocale_defined = True
+        if locale_.lower() != self.locale:
+            # Switching the locale loads its translations if not done already
+            self._loaded_locales = None
+        return self.eval_("::tkmsgcat::inlocale", locale_, *args)
 
     def is_init(self) -> bool:
-        tkbool = self.eval_("::msgcat::mcpackageconfig isset mcfolder")
-        return cast(bool, self.root.getboolean(tkbool))
+        return bool(self.eval_("::msgcat::mcpackageconfig", "isset", "mcfolder"))
 
     def is_loaded(self, locale_: str) -> bool:
-        tklist = self.eval_("::msgcat::mcloadedlocales loaded")
-        return locale_ in self._splitlist(tklist)
+        return locale_ in self.loaded_locales
 
     @overload
     def load(self, dir_: str) -> None:
@@ -166,72 +337,173 @@ class MessageCatalog:
         ...  # pragma: no cover
 
     def load(self, dir_: str | pathlib.Path) -> None:
-        _path = dir_ if isinstance(dir_, pathlib.Path) else pathlib.Path(dir_)
-        _resolvedpath = _path.resolve()
-        # ! Tk bug: All backslashes need to be replaced by formward slashes
-        msgsdir = str(_resolvedpath).replace("\\", "/")
+        key = (os.getcwd(), os.fspath(dir_))
+        msgsdir = self._resolved_cache.get(key)
+        if msgsdir is None:
+            # Imported lazily, pathlib is slow to import and rarely needed
+            import pathlib  # pylint: disable=import-outside-toplevel
+
+            _path = dir_ if isinstance(dir_, pathlib.Path) else pathlib.Path(dir_)
+            msgsdir = str(_path.resolve())
+            if _BS_TO_FS is not None:
+                msgsdir = msgsdir.translate(_BS_TO_FS)
+            _cache_put(self._resolved_cache, key, msgsdir)
         log.debug("Loading translations from %s", msgsdir)
-        self.eval_(
-            f'::msgcat::mcload [file join [file dirname [info script]] "{msgsdir}"]'
-        )
+        self.eval_("::msgcat::mcload", msgsdir)
+        self._clear_caches()
 
     @property
     def locale(self) -> str:
-        return self.eval_("::msgcat::mclocale")
+        self._check_root()
+        if self._locale is None:
+            self._locale = sys.intern(str(self.eval_("::msgcat::mclocale")))
+        return self._locale
 
     @locale.setter
     def locale(self, newlocale: str) -> None:
-        self.eval_(f"::msgcat::mclocale {newlocale}")
+        oldlocale = self._locale
+        self._locale = sys.intern(str(self.eval_("::msgcat::mclocale", newlocale)))
+        # Tcl loads translations for a newly set locale, but not when unchanged
+        if self._locale != oldlocale:
+            self._clear_caches()
 
     @property
     def loaded_locales(self) -> tuple[str]:
-        tklist = self.eval_("::msgcat::mcloadedlocales loaded")
-        return self._splitlist(tklist)
+        self._check_root()
+        loaded = self._loaded_locales
+        if loaded is None:
+            loaded = self._eval_list("::msgcat::mcloadedlocales", "loaded")
+            self._loaded_locales = loaded
+        return loaded
 
     loaded_from = _PackageOption("mcfolder")
 
     def longest(self, strings: tuple[str]) -> int:
-        return int(self.eval_(f"::msgcat::mcmax {self._join(*strings)}"))
+        return self._longest(self.locale, strings)
 
     def longest_in(self, locale_: str, strings: tuple[str]) -> int:
-        with self._locale_ctx(locale_):
-            return self.longest(strings)
+        return self._longest(locale_.lower(), strings)
+
+    def _longest(self, locale_: str, strings: tuple[str]) -> int:
+        self._check_root()
+        # Avoid mcmax, which translates every string again, when all the
+        # translations are already cached. Tcl 8.6 counts characters outside
+        # the BMP as two, so such translations are left to mcmax as well.
+        translations = self._cache.get(locale_, {})
+        lengths = []
+        for what in strings:
+            translation = translations.get(what)
+            if translation is None or max(translation, default="") > "\uffff":
+                return int(self._eval_in(locale_, "::msgcat::mcmax", *strings))
+            lengths.append(len(translation))
+        return max(lengths, default=0)
 
     @property
     def preferences(self) -> tuple[str]:
-        tklist = self.eval_("::msgcat::mcpreferences")
-        return self._splitlist(tklist)
+        # Same as msgcat::GetPreferences, the list only depends on the locale
+        locale_ = self.locale
+        prefs = [locale_]
+        while "_" in locale_:
+            locale_ = locale_[: locale_.rindex("_")]
+            # Multiple "_" are treated as one separator
+            if not locale_.endswith("_"):
+                prefs.append(locale_)
+        if prefs[-1]:
+            prefs.append("")
+        # pylint: disable=deprecated-typing-alias
+        return cast(Tuple[str], tuple(prefs))
+
+    def _preferences_tcl(self) -> tuple[str]:
+        return self._eval_list("::msgcat::mcpreferences")
 
     def has(self, what: str, search_all: bool = True) -> bool:
-        command = "::msgcat::mcexists"
-        if not search_all:
-            command += " -exactlocale"
-        command += f" {what}"
-        return cast(bool, self.root.getboolean(self.eval_(command)))
+        locale_ = self.locale
+        key = (locale_, what, search_all)
+        exists = self._has_cache.get(key)
+        if exists is None:
+            # Tcl returns an int which needs no further parsing
+            args = ("-exactlocale", what) if not search_all else (what,)
+            exists = bool(self._eval_in(locale_, "::msgcat::mcexists", *args))
+            _cache_put(self._has_cache, key, exists)
+        return exists
 
     def add(self, what: str, translation: str) -> None:
-        self.eval_(f'::msgcat::mcset {self.locale} "{what}" "{translation}"')
+        self.add_to(self.locale, what, translation)
 
     def add_to(self, locale_: str, what: str, translation: str) -> None:
-        self.eval_(f'::msgcat::mcset {locale_} "{what}" "{translation}"')
+        if self._batch is not None:
+            self._batch.setdefault(locale_.lower(), []).extend([what, translation])
+            return
+        self.eval_("::msgcat::mcset", locale_, what, translation)
+        self._forget(locale_)
 
     def update(self, translations: dict[str, str]) -> None:
-        self.eval_(
-            f"::msgcat::mcmset {self.locale} {{{self._dict2str(translations)}}}",
-        )
+        self.update_to(self.locale, translations)
 
     def update_to(self, locale_: str, translations: dict[str, str]) -> None:
-        self.eval_(f"::msgcat::mcmset {locale_} {{{self._dict2str(translations)}}}")
+        pairs: list[str] = []
+        for what, translation in translations.items():
+            pairs += [what, translation]
+        if self._batch is not None:
+            self._batch.setdefault(locale_.lower(), []).extend(pairs)
+            return
+        self.eval_("::msgcat::mcmset", locale_, pairs)
+        self._forget(locale_)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._batch is not None:
+            # Nested batches are flushed by the outermost one
+            yield None
+            return
+        pending = self._batch = {}
+        try:
+            yield None
+        finally:
+            self._batch = None
+        # Not reached when the block raised, the pending pairs are dropped then
+        for locale_, pairs in pending.items():
+            self.eval_("::msgcat::mcmset", locale_, pairs)
+            self._forget(locale_)
 
     def get(self, what: str, *fmtargs: str) -> str:
-        command = f'::msgcat::mc "{what}"'
+        return self._get(self.locale, what, fmtargs)
+
+    def _get(self, locale_: str, what: str, fmtargs: tuple[str, ...]) -> str:
+        self._check_root()
         if fmtargs:
-            command = command + " " + self._join(*fmtargs)
-        return self.eval_(command)
+            key = (locale_, what, fmtargs)
+            translation = self._fmt_cache.get(key)
+            if translation is None:
+                translation = _tcl_str(
+                    self._eval_in(locale_, "::msgcat::mc", what, *fmtargs)
+                )
+                if self._cacheable(locale_, what):
+                    _cache_put(self._fmt_cache, key, translation)
+            return translation
+
+        translations = self._cache.get(locale_)
+        if translations is None:
+            translations = self._cache[locale_] = {}
+        translation = translations.get(what)
+        if translation is None:
+            translation = _tcl_str(self._eval_in(locale_, "::msgcat::mc", what))
+            if self._cacheable(locale_, what):
+                # Interned keys let subsequent lookups compare by identity
+                _cache_put(translations, sys.intern(what), translation)
+        return translation
+
+    def _cacheable(self, locale_: str, what: str) -> bool:
+        # A missing handler must be invoked for every lookup of a string
+        # without a translation, so what it returns isn't cached.
+        option = cast(_PackageOption, type(self).missing_handler)
+        if not option.is_set(self):
+            return True
+        return bool(self._eval_in(locale_, "::msgcat::mcexists", what))
 
     def get_from(self, locale_: str, what: str, *fmtargs: str) -> str:
-        with self._locale_ctx(locale_):
-            return self.get(what, *fmtargs)
+        # Tcl treats locales case insensitively
+        return self._get(locale_.lower(), what, fmtargs)
 
     # TODO Doesn't work
     # locale_handler = _Handler("changecmd")
@@ -243,6 +515,10 @@ class MessageCatalog:
 
     def unload(self) -> None:
         self.eval_("::msgcat::mcforgetpackage")
+        _PackageOption.forget_all(self)
+        # Resolve directories again, symlinks might point elsewhere now
+        self._resolved_cache.clear()
+        self._reset()
 
 
 _default_msgcat = MessageCatalog()
@@ -404,6 +680,24 @@ def update_to(locale_: str, translations: dict[str, str]) -> None:
     _default_msgcat.update_to(locale_, translations)
 
 
+def batch() -> contextlib.AbstractContextManager[None]:
+    """Defers `add`, `add_to`, `update` and `update_to` until the block exits.
+
+    All the translations queued for a locale are then set at once, which is
+    much faster when adding lots of translations one by one.
+
+    Example:
+        >>> with batch():
+        ...     for src, translation in translations:
+        ...         add_to("hi", src, translation)
+
+    Caution:
+        Queued translations aren't available before the block exits. None of
+        them are set if the block raises an exception.
+    """
+    return _default_msgcat.batch()
+
+
 def get(what: str, *fmtargs: str) -> str:
     """Translate a string according to a user's current locale.
 
@@ -458,7 +752,8 @@ def missing_handler(func: Callable[..., str] | None = None) -> None:
     """Register the callback invoked when a translation is not found.
 
     It is invoked with the same arguments passed to `translate`. It must
-    return a formatted message as `translate` would do normally.
+    return a formatted message as `translate` would do normally. What it
+    returns isn't cached, so it is invoked on every such lookup.
 
     Args:
         func (Callable, optional): The handler is set when this has a value